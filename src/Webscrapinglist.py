@@ -6,63 +6,87 @@
 
 import requests
 import pandas as pd
-import time
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared OpenAlex client: session, retries, polite pool and the global rate limit
+from openalex_client import paginate
+
+# Optional: pyarrow enables the Parquet copy of the merged file
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
 # Directory to save individual files
 output_dir = "openalex_field_outputs"
-os.makedirs(output_dir, exist_ok=True)
+
+# Fields are paginated in parallel (each cursor is sequential, fields are independent);
+# the overall request rate is capped in openalex_client
+MAX_PARALLEL_FIELDS = 4
+REQUEST_TIMEOUT = 30
+
+# Explicit dtypes for reading the merged CSV back (low-cardinality text as category)
+MERGED_DTYPES = {
+    "name": "string",
+    "orcid": "string",
+    "institution_id": "string",
+    "affiliation": "category",
+    "country": "category",
+    "works_count": "Int32",
+    "cited_by_count": "Int32",
+    "fields": "string",
+    "field_group": "category"
+}
+
+def load_merged_researchers(path="all_researchers_merged.csv", chunksize=None):
+    """Reads the merged CSV with MERGED_DTYPES; with chunksize, returns an iterator of typed chunks"""
+    # Only empty cells are missing: "NA" is Namibia's country code and "N/A" is our placeholder
+    return pd.read_csv(path, dtype=MERGED_DTYPES, engine="c", chunksize=chunksize,
+                       keep_default_na=False, na_values=[""])
 
 def fetch_researchers_onefile(field_id, field_name, max_authors=50000):
-    base_url = "https://api.openalex.org/authors"
-    cursor = "*"
     per_page = 200
     authors = []
     downloaded = 0
+    select = "display_name,orcid,last_known_institution,works_count,cited_by_count,x_concepts"
 
     print(f"📥 Starting: {field_name} — Max: {max_authors}")
 
-    while downloaded < max_authors:
-        params = {
-            "filter": f"x_concepts.id:{field_id}",
-            "per-page": per_page,
-            "cursor": cursor
-        }
-        response = requests.get(base_url, params=params)
-        if response.status_code != 200:
-            print(f"❌ Request failed for {field_name}: {response.status_code}")
-            break
-
-        data = response.json()
-        results = data.get("results", [])
-        if not results:
-            break
-
-        for author in results:
-            institution = author.get("last_known_institution", {})
-            authors.append({
-                "name": author.get("display_name"),
-                "orcid": author.get("orcid"),
-                "institution_id": institution.get("id", "N/A"),
-                "affiliation": institution.get("display_name", "N/A"),
-                "country": institution.get("country_code", "N/A"),
-                "works_count": author.get("works_count", 0),
-                "cited_by_count": author.get("cited_by_count", 0),
-                "fields": "; ".join([c["display_name"] for c in author.get("x_concepts", [])]),
-                "field_group": field_name
-            })
-
-        downloaded += len(results)
-        print(f"📊 {field_name}: Downloaded {downloaded}")
-
-        cursor = data.get("meta", {}).get("next_cursor")
-        if not cursor:
-            break
-
-        time.sleep(1)  # Respect OpenAlex rate limits
+    try:
+        for data in paginate("authors", f"x_concepts.id:{field_id}", select,
+                             per_page=per_page, timeout=REQUEST_TIMEOUT):
+            results = data.get("results", [])
+
+            for author in results:
+                institution = author.get("last_known_institution") or {}
+                authors.append({
+                    "name": author.get("display_name"),
+                    "orcid": author.get("orcid"),
+                    "institution_id": institution.get("id", "N/A"),
+                    "affiliation": institution.get("display_name", "N/A"),
+                    "country": institution.get("country_code", "N/A"),
+                    "works_count": author.get("works_count", 0),
+                    "cited_by_count": author.get("cited_by_count", 0),
+                    "fields": "; ".join([c["display_name"] for c in author.get("x_concepts", [])]),
+                    "field_group": field_name
+                })
+
+            downloaded += len(results)
+            print(f"📊 {field_name}: Downloaded {downloaded}")
+
+            if downloaded >= max_authors:
+                break
+    except requests.exceptions.HTTPError as e:
+        # Non-retryable status: keep what was collected so far
+        print(f"❌ Request failed for {field_name}: {e.response.status_code}")
 
     if authors:
         df = pd.DataFrame(authors)
+        os.makedirs(output_dir, exist_ok=True)
         file_path = os.path.join(output_dir, f"{field_name.replace(' ', '_').lower()}_researchers.csv")
         df.to_csv(file_path, index=False)
         print(f"✅ Saved {len(df)} researchers to: {file_path}")
@@ -85,22 +109,55 @@ fields = {
     "Social Sciences": "C2778407487"
 }
 
-# === Run for each field and collect file paths ===
-all_csv_paths = []
-
-for field_name, concept_id in fields.items():
-    file_path = fetch_researchers_onefile(field_id=concept_id, field_name=field_name, max_authors=50000)
-    if file_path:
-        all_csv_paths.append(file_path)
-
-# === Merge all into one final file ===
-print("\n🔗 Merging all field files into one master CSV...")
-
-merged_df = pd.concat([pd.read_csv(path) for path in all_csv_paths], ignore_index=True)
-merged_filename = "all_researchers_merged.csv"
-merged_df.to_csv(merged_filename, index=False)
-
-print(f"✅ All done! Merged file saved as: {merged_filename}")
+# Run the scrape only as a script, so the helpers above can be imported without side effects
+if __name__ == "__main__":
+    # === Run all fields in parallel and collect file paths (in field order) ===
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_FIELDS) as executor:
+        file_paths = list(executor.map(
+            lambda item: fetch_researchers_onefile(field_id=item[1], field_name=item[0], max_authors=50000),
+            fields.items()
+        ))
+
+    all_csv_paths = [path for path in file_paths if path]
+
+    # === Merge all into one final file ===
+    print("\n🔗 Merging all field files into one master CSV...")
+
+    # Stream the files byte-for-byte (same columns everywhere), keeping only the first header
+    merged_filename = "all_researchers_merged.csv"
+    with open(merged_filename, "wb") as out:
+        for i, path in enumerate(all_csv_paths):
+            with open(path, "rb") as src:
+                if i > 0:
+                    src.readline()  # skip header
+                shutil.copyfileobj(src, out, length=1 << 20)
+
+    print(f"✅ All done! Merged file saved as: {merged_filename}")
+
+    # === Parquet copy (multi-threaded Arrow CSV reader, zstd) ===
+    if pa is not None and all_csv_paths:
+        # Fixed column types so every field file yields the same schema
+        column_types = {
+            "name": pa.string(), "orcid": pa.string(),
+            "institution_id": pa.string(), "affiliation": pa.string(), "country": pa.string(),
+            "works_count": pa.int32(), "cited_by_count": pa.int32(),
+            "fields": pa.string(), "field_group": pa.string()
+        }
+        tables = [
+            pacsv.read_csv(
+                path,
+                read_options=pacsv.ReadOptions(use_threads=True),
+                # Only empty cells become null, matching the CSV ("NA" country, "N/A" placeholders)
+                convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True,
+                                                     null_values=[""])
+            )
+            for path in all_csv_paths
+        ]
+        parquet_filename = "all_researchers_merged.parquet"
+        pq.write_table(pa.concat_tables(tables), parquet_filename, compression="zstd")
+        print(f"✅ Parquet copy saved as: {parquet_filename}")
+    elif pa is None:
+        print("ℹ️ pyarrow not installed — skipping Parquet copy")
 
 
 # In[ ]:
@@ -3,10 +3,10 @@
 
 import json
 import os
-import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from openalex_authors_multifield import process_single_field
+from openalex_authors_multifield import process_single_field, MAX_PARALLEL_FIELDS
 
 # Configuração de logging
 def setup_logging():
@@ -63,38 +63,35 @@ def run_batch_collection():
     completed_fields = []
     failed_fields = []
     
-    for i, field_config in enumerate(field_configs):
-        field_name = field_config["nome"]
-        field_logger = create_field_logger(field_name)
-        
-        logger.info(f"[{i+1}/{len(field_configs)}] Iniciando processamento para {field_name}")
-        field_logger.info(f"Iniciando processamento para {field_name}")
-        
-        try:
-            # Executa a coleta para este campo
-            process_single_field(field_config)
-            
-            completed_fields.append(field_name)
-            logger.info(f"✅ Concluído: {field_name}")
-            field_logger.info(f"✅ Processamento concluído com sucesso")
-            
-            # Pausa entre campos para respeitar limites de taxa
-            if i < len(field_configs) - 1:
-                logger.info("⏳ Pausa entre campos...")
-                field_logger.info("⏳ Pausa entre campos...")
-                time.sleep(10)  # Pausa de 10 segundos entre campos
-                
-        except KeyboardInterrupt:
-            logger.error(f"🛑 Interrompido pelo usuário durante o processamento de {field_name}")
-            field_logger.error("🛑 Processamento interrompido pelo usuário")
-            failed_fields.append(field_name)
-            break
-        except Exception as e:
-            error_msg = f"❌ Erro ao processar {field_name}: {str(e)}"
-            logger.error(error_msg)
-            field_logger.error(f"❌ Erro: {str(e)}")
-            failed_fields.append(field_name)
-            continue
+    # Campos em paralelo; o ritmo global de requisições é controlado em openalex_client.api_get.
+    # Ctrl+C aciona a parada graciosa do scraper: cada campo termina a página e salva o cursor.
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_FIELDS) as executor:
+        futures = {}
+        for i, field_config in enumerate(field_configs):
+            field_name = field_config["nome"]
+            field_logger = create_field_logger(field_name)
+
+            logger.info(f"[{i+1}/{len(field_configs)}] Agendando processamento para {field_name}")
+            field_logger.info(f"Agendando processamento para {field_name}")
+
+            futures[executor.submit(process_single_field, field_config)] = field_name
+
+        for future in as_completed(futures):
+            field_name = futures[future]
+            field_logger = create_field_logger(field_name)
+
+            try:
+                future.result()
+
+                completed_fields.append(field_name)
+                logger.info(f"✅ Concluído: {field_name}")
+                field_logger.info(f"✅ Processamento concluído com sucesso")
+
+            except Exception as e:
+                error_msg = f"❌ Erro ao processar {field_name}: {str(e)}"
+                logger.error(error_msg)
+                field_logger.error(f"❌ Erro: {str(e)}")
+                failed_fields.append(field_name)
     
     # Gera relatório final
     logger.info("="*60)
@@ -4,52 +4,61 @@
 import os
 import re
 import csv
+import io
 import time
 import signal
 import requests
 import json
-from datetime import datetime, timezone
-from email.utils import parsedate_to_datetime
-from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
+
+from openalex_client import api_get, api_json, paginate
+
+# pyarrow (opcional) gera a cópia Parquet de cada campo concluído
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
 # === Configurações principais ===
 with open('config/campos_config.json', 'r', encoding='utf-8') as f:
     CONFIG = json.load(f)
 
-# Variáveis globais que serão atualizadas com base no campo atual
-ECONOMICS_ID = ""
-ECONOMICS_NAME = ""
-SAFE_FIELD = ""
 OUTPUT_DIR = "openalex_field_outputs"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
-OUT_PATH = ""
-CURSOR_PATH = ""
+CACHE_DIR = "cache"                      # subárvores de conceitos já carregadas
+CONCEPTS_CACHE_TTL = 7 * 24 * 3600       # a árvore de conceitos muda raramente
 
-# Configurações padrão - serão atualizadas com base na configuração do campo
 PER_PAGE_AUTHORS = 200
 
-# Pacing adaptativo e timeouts
-SLEEP = 0.15
-MIN_SLEEP, MAX_SLEEP = 0.05, 1.25
-BACKOFF_MULT, COOLDOWN_MULT = 1.5, 0.9
+AUTHORS_SELECT = "id,display_name,orcid,last_known_institutions,works_count,cited_by_count,x_concepts"
+
+# Campos coletados em paralelo (cada um com seu cursor); o ritmo global fica no openalex_client
+MAX_PARALLEL_FIELDS = 4
 
+# Timeouts
 AUTHORS_TIMEOUT = 20
 CONCEPTS_TIMEOUT = 20
 WORKS_TIMEOUT = 25
 
-# Filtros "estritos porém inclusivos"
+# Filtros "estritos porém inclusivos" (padrões; cada campo pode sobrescrever em parametros_filtro)
 MIN_ECON_SCORE = 20                  # mínimo absoluto (0–100)
 REQUIRE_ECON_TOP_K = 5               # Economia precisa estar no top-5 conceitos
 MIN_ECON_RELATIVE = 0.6              # score de Economia >= 60% do score do conceito top
 BORDERLINE_SCORE = 45                # abaixo disso, exige checar proporção de trabalhos
 MIN_ECON_SHARE = 0.40                # se borderline: ≥40% dos trabalhos devem ser de Economia
-SLEEP_BETWEEN_COUNTS = 0.1           # pausa entre consultas de contagem
+MIN_WORKS_FOR_SHARE = 5              # borderline com menos trabalhos que isso é rejeitado sem contar
+COUNT_WORKERS = 8                    # contagens de borderline em paralelo (por página)
+GROUP_BY_CHUNK = 25                  # autores por consulta group_by (coautores também viram grupos)
+GROUP_BY_PER_PAGE = 200              # grupos devolvidos por página de group_by
+GROUP_BY_MAX_PAGES = 5               # páginas de group_by seguidas antes de contar os faltantes um a um
 
 SKIP_SHARE_IF_TOP_IS_ECON = True     # Se o conceito principal já for de Economia, pula a checagem de proporção
 
-# Sessão HTTP e cabeçalhos
-SESSION = requests.Session()
-SESSION.headers.update({"Accept-Encoding": "gzip", "User-Agent": "econ-fast/2.0"})
+# Pool de threads para as contagens de trabalhos (borderline)
+_COUNT_EXECUTOR = ThreadPoolExecutor(max_workers=COUNT_WORKERS)
 
 # Esquema do CSV (colunas)
 CSV_FIELDS = [
@@ -62,6 +71,9 @@ CSV_FIELDS = [
     "is_primary_in_field"
 ]
 
+# Parquet: linhas por row group na exportação de cada campo
+PARQUET_ROW_GROUP = 50_000
+
 # Variáveis globais para controle de parada graciosa
 _SHOULD_STOP = False
 
@@ -72,163 +84,178 @@ def _handle_sigint(signum, frame):
 
 signal.signal(signal.SIGINT, _handle_sigint)
 
-def update_config_for_field(field_config):
-    """Atualiza as variáveis globais com base na configuração do campo"""
-    global ECONOMICS_ID, ECONOMICS_NAME, SAFE_FIELD, OUT_PATH, CURSOR_PATH
-    global MIN_ECON_SCORE, REQUIRE_ECON_TOP_K, MIN_ECON_RELATIVE, BORDERLINE_SCORE, MIN_ECON_SHARE
-    
-    ECONOMICS_ID = field_config["id"]
-    ECONOMICS_NAME = field_config["nome"]
-    SAFE_FIELD = field_config["nome_seguro"]
-    
-    # Atualiza parâmetros de filtro com base na configuração do campo
-    if "parametros_filtro" in field_config:
-        filtros = field_config["parametros_filtro"]
-        MIN_ECON_SCORE = filtros.get("min_score", MIN_ECON_SCORE)
-        REQUIRE_ECON_TOP_K = filtros.get("top_k", REQUIRE_ECON_TOP_K)
-        MIN_ECON_RELATIVE = filtros.get("min_relative", MIN_ECON_RELATIVE)
-        BORDERLINE_SCORE = filtros.get("borderline_score", BORDERLINE_SCORE)
-        MIN_ECON_SHARE = filtros.get("min_share", MIN_ECON_SHARE)
-    
-    OUT_PATH = field_config["arquivo_saida"]
-    CURSOR_PATH = field_config["arquivo_cursor"]
+def field_settings(field_config):
+    """Monta as configurações de um campo (sem globais, para coletar vários campos em paralelo)"""
+    filtros = field_config.get("parametros_filtro", {})
+    return {
+        "id": field_config["id"],
+        "name": field_config["nome"],
+        "safe_name": field_config["nome_seguro"],
+        "out_path": field_config["arquivo_saida"],
+        "cursor_path": field_config["arquivo_cursor"],
+        "min_score": filtros.get("min_score", MIN_ECON_SCORE),
+        "top_k": filtros.get("top_k", REQUIRE_ECON_TOP_K),
+        "min_relative": filtros.get("min_relative", MIN_ECON_RELATIVE),
+        "borderline_score": filtros.get("borderline_score", BORDERLINE_SCORE),
+        "min_share": filtros.get("min_share", MIN_ECON_SHARE),
+        "min_works_for_share": filtros.get("min_works_for_share", MIN_WORKS_FOR_SHARE),
+    }
 
 def _cid(s: str) -> str:
     """Extrai o ID do final de uma URL (ex.: https://openalex.org/C123 → C123)"""
-    if s:
-        return s.split('/')[-1]
-    return ""
-
-def parse_retry_after(h, default_seconds=2):
-    """Interpreta o cabeçalho Retry-After da API"""
-    if not h:
-        return default_seconds
-    
-    try:
-        # Tenta interpretar como número inteiro
-        return max(1, int(h))
-    except ValueError:
-        try:
-            # Tenta interpretar como data HTTP
-            dt = parsedate_to_datetime(h)
-            now = datetime.now(timezone.utc)
-            diff = dt - now
-            return max(1, int(diff.total_seconds()))
-        except:
-            return default_seconds
+    if not s:
+        return ""
+    return s[s.rfind('/') + 1:]
 
-def _get(url, params=None, timeout=30):
-    """Wrapper simples para SESSION.get com params e timeout apropriados"""
-    try:
-        response = SESSION.get(url, params=params, timeout=timeout)
-        return response
-    except requests.exceptions.RequestException as e:
-        print(f"⚠️ Request failed: {e}")
-        return None
-
-def load_econ_descendants():
+def load_econ_descendants(field_id, field_name=""):
     """Pré-carrega todos os subconceitos do campo (subárvore) para avaliar relevância sem precisar de chamadas extras por autor"""
-    base = "https://api.openalex.org/concepts"
-    cursor = "*"
-    ids = {ECONOMICS_ID}
-    sleep_s = 0.2
-    print(f"🔎 Preloading {ECONOMICS_NAME} subtree (concept IDs)...")
-
-    while True:
-        params = {
-            "filter": f"ancestors.id:{ECONOMICS_ID}",
-            "per-page": 200,
-            "cursor": cursor,
-            "select": "id"
-        }
-        
-        r = _get(base, params=params, timeout=CONCEPTS_TIMEOUT)
-        if not r:
-            print("⚠️ Failed to load concept descendants, continuing with empty set")
-            return set()
-        
-        if r.status_code == 429:
-            retry_after = parse_retry_after(r.headers.get('Retry-After'))
-            print(f"⏳ Rate limited. Sleeping for {retry_after}s")
-            time.sleep(retry_after)
-            continue
-        
-        if r.status_code >= 500:
-            print(f"⚠️ Server error {r.status_code}, backing off")
-            time.sleep(2)
-            continue
-        
+    cache_path = os.path.join(CACHE_DIR, f"concepts_{field_id}.json")
+    if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < CONCEPTS_CACHE_TTL:
         try:
-            data = r.json()
-        except:
-            print("⚠️ Failed to parse response as JSON")
-            break
-        
-        new_ids = {item['id'].split('/')[-1] for item in data.get('results', [])}
-        ids.update(new_ids)
-        
-        cursor = data.get('meta', {}).get('next_cursor')
-        if not cursor:
-            break
-        
-        time.sleep(sleep_s)
-        
-        # Aplica cooldown
-        sleep_s = max(MIN_SLEEP, sleep_s * COOLDOWN_MULT)
-    
-    print(f"✅ Loaded {len(ids)} concept IDs for {ECONOMICS_NAME}")
-    return ids
-
-def init_csv(path):
-    """Abre o CSV em append e escreve o cabeçalho se necessário"""
-    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
-    f = open(path, "a", newline="", encoding="utf-8")
-    w = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            with open(cache_path, "r", encoding="utf-8") as fh:
+                ids = frozenset(json.load(fh))
+            print(f"✅ Loaded {len(ids)} concept IDs for {field_name} from cache")
+            return ids
+        except ValueError:
+            print(f"⚠️ Corrupt concept cache for {field_name}, reloading from the API")
+
+    ids = {field_id}
+    complete = False
+    print(f"🔎 Preloading {field_name} subtree (concept IDs)...")
+
+    try:
+        for data in paginate("concepts", f"ancestors.id:{field_id}", "id", timeout=CONCEPTS_TIMEOUT):
+            ids.update(_cid(item['id']) for item in data.get('results', []))
+        else:
+            complete = True
+    except (requests.exceptions.HTTPError, ValueError) as e:
+        print(f"⚠️ Failed to load concept descendants ({e}), continuing with what was loaded")
+
+    print(f"✅ Loaded {len(ids)} concept IDs for {field_name}")
+
+    # Só persiste a subárvore completa (uma falha no meio não vira cache), via .tmp + os.replace
+    if complete:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(sorted(ids), fh)
+        os.replace(tmp_path, cache_path)
+    return frozenset(ids)
+
+def _csv_bytes(rows):
+    """Codifica várias linhas de CSV num único bloco de bytes (uma escrita por página)"""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+def init_csv(path, resume):
+    """Abre <path>.tmp (buffer de 1 MiB) e escreve o cabeçalho se necessário.
+
+    O CSV final só aparece via os.replace ao concluir ou na parada graciosa. Com resume
+    (há cursor salvo), continua em append o .tmp deixado por uma execução derrubada ou o
+    CSV da parada graciosa; sem cursor, começa um .tmp vazio (nada a retomar).
+    """
+    tmp_path = path + ".tmp"
+    if not resume:
+        f = open(tmp_path, "wb", buffering=1 << 20)
+        f.write(_csv_bytes([CSV_FIELDS]))
+        return f, tmp_path
+
+    if not os.path.exists(tmp_path) and os.path.exists(path):
+        os.replace(path, tmp_path)   # retomada: continua a partir do CSV já finalizado
+    write_header = not os.path.exists(tmp_path) or os.path.getsize(tmp_path) == 0
+    f = open(tmp_path, "ab", buffering=1 << 20)
     if write_header:
-        w.writeheader()
-    return f, w
+        f.write(_csv_bytes([CSV_FIELDS]))
+    return f, tmp_path
+
+def _parquet_column_types():
+    """Tipos fixos das colunas de CSV_FIELDS (mesmo schema em todos os campos)"""
+    types = {name: pa.string() for name in CSV_FIELDS}
+    types.update({
+        "works_count": pa.int64(),
+        "cited_by_count": pa.int64(),
+        "primary_concept_score": pa.float64(),
+        "best_in_field_score": pa.float64(),
+        "is_primary_in_field": pa.bool_(),
+    })
+    return types
+
+def export_parquet(csv_path):
+    """Converte o CSV final do campo em Parquet (zstd), lendo em streaming e gravando row groups de PARQUET_ROW_GROUP linhas"""
+    if pa is None:
+        print("ℹ️ pyarrow not installed — skipping Parquet export")
+        return None
 
-def save_cursor(next_cursor: str | None):
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    tmp_path = parquet_path + ".tmp"
+    # Só célula vazia vira null: "NA" (Namíbia) e o marcador "N/A" continuam texto, como no CSV
+    convert = pacsv.ConvertOptions(column_types=_parquet_column_types(), strings_can_be_null=True,
+                                   null_values=[""])
+    reader = pacsv.open_csv(csv_path, convert_options=convert)
+
+    pending, pending_rows = [], 0
+    with pq.ParquetWriter(tmp_path, reader.schema, compression="zstd") as writer:
+        for record_batch in reader:
+            pending.append(record_batch)
+            pending_rows += record_batch.num_rows
+            if pending_rows >= PARQUET_ROW_GROUP:
+                writer.write_table(pa.Table.from_batches(pending))
+                pending, pending_rows = [], 0
+        if pending:
+            writer.write_table(pa.Table.from_batches(pending))
+
+    os.replace(tmp_path, parquet_path)
+    print(f"🧱 Parquet saved: {parquet_path}")
+    return parquet_path
+
+# Conteúdo do arquivo de cursor de um campo já concluído (não é reaberto nem recebe append)
+CURSOR_DONE = "done"
+
+def save_cursor(cursor_path, next_cursor: str | None):
     """Persiste o cursor da página seguinte (checkpoint)"""
     if next_cursor:
-        with open(CURSOR_PATH, "w", encoding="utf-8") as fh:
+        with open(cursor_path, "w", encoding="utf-8") as fh:
             fh.write(next_cursor)
 
-def load_cursor():
+def load_cursor(cursor_path):
     """Lê o cursor salvo; se não houver, retorna '*' (início da paginação)"""
-    if os.path.exists(CURSOR_PATH):
-        s = open(CURSOR_PATH, "r", encoding="utf-8").read().strip()
+    if os.path.exists(cursor_path):
+        s = open(cursor_path, "r", encoding="utf-8").read().strip()
         if s:
             return s
     return "*"
 
-@lru_cache(maxsize=1000)
+# Caches por execução das contagens individuais (sem limite, ao contrário de um LRU pequeno)
+_TOTAL_CACHE: dict[str, int] = {}
+_ECON_CACHE: dict[tuple[str, str], int] = {}
+
 def _author_total_works(author_id_url: str) -> int:
     """Conta todos os trabalhos do autor via filtro authorships.author.id:<AID>"""
+    if author_id_url in _TOTAL_CACHE:
+        return _TOTAL_CACHE[author_id_url]
+
     author_id = _cid(author_id_url)
     if not author_id:
         return 0
     
     filter_str = f"authorships.author.id:{author_id}"
-    count = _count_works(filter_str)
-    
-    # Pausa curta por cortesia
-    time.sleep(SLEEP_BETWEEN_COUNTS)
-    return count
+    _TOTAL_CACHE[author_id_url] = _count_works(filter_str)
+    return _TOTAL_CACHE[author_id_url]
 
-@lru_cache(maxsize=1000)
 def _author_econ_works(author_id_url: str, econ_id: str) -> int:
     """Conta trabalhos do autor que são do campo via filtro concepts.id:<FIELD_ID>"""
+    key = (author_id_url, econ_id)
+    if key in _ECON_CACHE:
+        return _ECON_CACHE[key]
+
     author_id = _cid(author_id_url)
     if not author_id or not econ_id:
         return 0
     
     filter_str = f"authorships.author.id:{author_id},concepts.id:{econ_id}"
-    count = _count_works(filter_str)
-    
-    # Pausa curta por cortesia
-    time.sleep(SLEEP_BETWEEN_COUNTS)
-    return count
+    _ECON_CACHE[key] = _count_works(filter_str)
+    return _ECON_CACHE[key]
 
 def _count_works(filter_str: str) -> int:
     """Chama /works com per-page=1 e select=id apenas para ler meta.count"""
@@ -239,191 +266,282 @@ def _count_works(filter_str: str) -> int:
         "select": "id"
     }
     
-    r = _get(base_url, params=params, timeout=WORKS_TIMEOUT)
+    r = api_get(base_url, params=params, timeout=WORKS_TIMEOUT)
     if not r or r.status_code != 200:
         return 0
     
     try:
-        data = r.json()
+        data = api_json(r)
         return data.get("meta", {}).get("count", 0)
     except:
         return 0
 
+def _group_counts(filter_str: str, wanted):
+    """Chama /works com group_by=authorships.author.id; retorna ({AID: count}, completo?)
+
+    Os grupos incluem coautores e vêm ordenados por contagem, então os autores com
+    poucos trabalhos ficam no fim: segue o cursor até todos os IDs de wanted aparecerem
+    (ou os grupos acabarem), no máximo GROUP_BY_MAX_PAGES páginas.
+    """
+    base_url = "https://api.openalex.org/works"
+    counts = {}
+    missing = set(wanted)
+    cursor = "*"
+
+    for _ in range(GROUP_BY_MAX_PAGES):
+        params = {
+            "filter": filter_str,
+            "group_by": "authorships.author.id",
+            "per-page": GROUP_BY_PER_PAGE,
+            "cursor": cursor
+        }
+
+        r = api_get(base_url, params=params, timeout=WORKS_TIMEOUT)
+        if not r or r.status_code != 200:
+            return counts, False
+
+        try:
+            data = api_json(r)
+        except:
+            return counts, False
+
+        groups = data.get("group_by", [])
+        for g in groups:
+            aid = _cid(g.get("key"))
+            counts[aid] = g.get("count", 0)
+            missing.discard(aid)
+
+        cursor = data.get("meta", {}).get("next_cursor")
+        # Todos encontrados, ou grupos esgotados (ausente = 0 trabalhos)
+        if not missing or not groups or not cursor:
+            return counts, True
+
+    return counts, False
+
+# Contagens (econ, total) por (author_id_url, econ_id), preenchidas em lote por load_work_counts
+_WORK_COUNTS = {}
+
+def load_work_counts(author_id_urls, econ_id):
+    """Preenche _WORK_COUNTS com uma consulta group_by por lote de GROUP_BY_CHUNK autores (total e campo)"""
+    pending = {_cid(a_id): a_id for a_id in author_id_urls
+               if a_id and (a_id, econ_id) not in _WORK_COUNTS}
+    aids = list(pending)
+    chunks = [aids[i:i + GROUP_BY_CHUNK] for i in range(0, len(aids), GROUP_BY_CHUNK)]
+
+    futures = []
+    for chunk in chunks:
+        authors_filter = "authorships.author.id:" + "|".join(chunk)
+        futures.append((
+            chunk,
+            _COUNT_EXECUTOR.submit(_group_counts, authors_filter, chunk),
+            _COUNT_EXECUTOR.submit(_group_counts, f"{authors_filter},concepts.id:{econ_id}", chunk)
+        ))
+
+    counted = []
+    for chunk, total_f, econ_f in futures:
+        totals, totals_complete = total_f.result()
+        econs, econs_complete = econ_f.result()
+        for aid in chunk:
+            a_id = pending[aid]
+            # Ausente numa resposta completa = 0; ausente numa truncada/falha = conta individualmente, no pool
+            if aid in totals or totals_complete:
+                total = totals.get(aid, 0)
+            else:
+                total = _COUNT_EXECUTOR.submit(_author_total_works, a_id)
+            if aid in econs or econs_complete:
+                econ = econs.get(aid, 0)
+            else:
+                econ = _COUNT_EXECUTOR.submit(_author_econ_works, a_id, econ_id)
+            counted.append((a_id, econ, total))
+
+    for a_id, econ, total in counted:
+        if isinstance(econ, Future):
+            econ = econ.result()
+        if isinstance(total, Future):
+            total = total.result()
+        _WORK_COUNTS[(a_id, econ_id)] = (econ, total)
+
 def econ_share_ok(author_id_url, econ_id, min_share) -> bool:
     """Calcula proporção econ / total e compara com min_share (ex.: 0.40)"""
-    total = _author_total_works(author_id_url)
+    if (author_id_url, econ_id) not in _WORK_COUNTS:
+        load_work_counts([author_id_url], econ_id)
+    econ_count, total = _WORK_COUNTS.get((author_id_url, econ_id), (0, 0))
     if total <= 0:
         return False
-    
-    econ_count = _author_econ_works(author_id_url, econ_id)
+
     share = econ_count / total
     return share >= min_share
 
-def author_passes_field_filter_strict(author: dict, field_desc: set):
-    """Filtro principal do autor: lógica completa"""
+def check_econ_shares(author_id_urls, econ_id, min_share) -> dict:
+    """Aplica econ_share_ok a vários autores, carregando as contagens em lote antes"""
+    load_work_counts(author_id_urls, econ_id)
+    return {a_id: econ_share_ok(a_id, econ_id, min_share) for a_id in author_id_urls}
+
+def _field_filter_precheck(author: dict, field_desc: frozenset, field: dict):
+    """Critérios locais do filtro (sem rede). Retorna (ok, needs_share, details)"""
     xcs = author.get("x_concepts") or []
     if not xcs:
-        return False, {}
+        return False, False, {}
 
-    # Normaliza e ordena conceitos por score decrescente
-    concepts = [{
-        "id": _cid(c.get("id")),
-        "display_name": c.get("display_name"),
-        "score": float(c.get("score") or 0.0)
-    } for c in xcs]
-    concepts.sort(key=lambda z: z["score"], reverse=True)
+    # Normaliza em tuplas (id, nome, score) e ordena por score decrescente (ordenação estável);
+    # o ID curto é o _cid inline (fatia após a última '/'), sem chamada de função por conceito
+    concepts = [((u := c.get("id") or "")[u.rfind('/') + 1:], c.get("display_name"), float(c.get("score") or 0.0))
+                for c in xcs]
+    concepts.sort(key=itemgetter(2), reverse=True)
 
-    top = concepts[0] if concepts else {"id": "", "display_name": "", "score": 0.0}
+    top_id, top_name, top_score = concepts[0]
 
     # 1) Campo aparece no top-K?
-    if REQUIRE_ECON_TOP_K and REQUIRE_ECON_TOP_K > 0:
-        if not any(c["id"] in field_desc for c in concepts[:REQUIRE_ECON_TOP_K]):
-            return False, {}
-
-    # 2) Melhor conceito do campo com score mínimo
-    best_field = None
-    best_field_score = 0.0
-    for c in concepts:
-        if c["id"] in field_desc and c["score"] >= float(MIN_ECON_SCORE):
-            if c["score"] > best_field_score:
-                best_field = c
-                best_field_score = c["score"]
+    top_k = field["top_k"]
+    if top_k and top_k > 0:
+        top_ids = {c[0] for c in concepts[:top_k]}
+        if top_ids.isdisjoint(field_desc):
+            return False, False, {}
+
+    # 2) Melhor conceito do campo com score mínimo: com a lista ordenada, é o primeiro do campo
+    best_field = next((c for c in concepts if c[0] in field_desc), None)
     if best_field is None:
-        return False, {}
+        return False, False, {}
+    best_field_id, best_field_name, best_field_score = best_field
+    if best_field_score < float(field["min_score"]) or best_field_score <= 0.0:
+        return False, False, {}
 
     # 3) Força relativa: campo forte o bastante vs. conceito top?
-    if MIN_ECON_RELATIVE is not None:
-        if best_field_score < MIN_ECON_RELATIVE * float(top["score"] or 0.0):
-            return False, {}
-
-    # 4) Se borderline, verificar participação de trabalhos no campo
-    if best_field_score < BORDERLINE_SCORE:
-        if SKIP_SHARE_IF_TOP_IS_ECON and (top["id"] in field_desc):
-            pass
+    if field["min_relative"] is not None:
+        if best_field_score < field["min_relative"] * top_score:
+            return False, False, {}
+
+    # 4) Se borderline, decide primeiro pelos critérios baratos; só sobra a checagem de proporção (rede)
+    primary_is_field = top_id in field_desc
+    needs_share = False
+    if best_field_score < field["borderline_score"]:
+        if SKIP_SHARE_IF_TOP_IS_ECON and primary_is_field:
+            pass                                   # conceito principal já é do campo: aceita
+        elif (author.get("works_count") or 0) < field["min_works_for_share"]:
+            return False, False, {}                # poucos trabalhos para uma proporção confiável
         else:
-            if not econ_share_ok(author.get("id"), ECONOMICS_ID, MIN_ECON_SHARE):
-                return False, {}
+            needs_share = True
 
     details = {
-        "primary_concept_id": top["id"],
-        "primary_concept_name": top["display_name"],
-        "primary_concept_score": top["score"],
+        "primary_concept_id": top_id,
+        "primary_concept_name": top_name,
+        "primary_concept_score": top_score,
         "best_in_field_score": best_field_score,
-        "best_in_field_id": best_field.get("id"),
-        "best_in_field_name": best_field.get("display_name"),
-        "is_primary_in_field": top["id"] in field_desc
+        "best_in_field_id": best_field_id,
+        "best_in_field_name": best_field_name,
+        "is_primary_in_field": primary_is_field
     }
+    return True, needs_share, details
+
+def author_passes_field_filter_strict(author: dict, field_desc: frozenset, field: dict, share_ok=None):
+    """Filtro principal do autor: lógica completa (share_ok pode vir pré-calculado)"""
+    ok, needs_share, details = _field_filter_precheck(author, field_desc, field)
+    if not ok:
+        return False, {}
+    if needs_share:
+        if share_ok is None:
+            share_ok = econ_share_ok(author.get("id"), field["id"], field["min_share"])
+        if not share_ok:
+            return False, {}
     return True, details
 
-def fetch_authors_for_field():
-    """Loop principal de coleta para o campo atual"""
-    global SLEEP
-    
-    field_desc = load_econ_descendants()   # prefetch
-    base_url = "https://api.openalex.org/authors"
-    cursor = load_cursor()
-    scanned = kept_total = 0
+def _page_columns(kept, field_name):
+    """Monta as colunas de CSV_FIELDS (uma lista por coluna) para os autores aprovados da página"""
+    insts = []
+    for a, _ in kept:
+        lki = a.get("last_known_institutions") or []
+        insts.append(lki[0] if (isinstance(lki, list) and lki) else {})
+    dets = [det for _, det in kept]
+
+    return {
+        "author_id": [a.get("id") for a, _ in kept],
+        "name": [a.get("display_name") for a, _ in kept],
+        "orcid": [a.get("orcid") for a, _ in kept],
+        "institution_id": [inst.get("id", "N/A") for inst in insts],
+        "affiliation": [inst.get("display_name", "N/A") for inst in insts],
+        "country": [inst.get("country_code", "N/A") for inst in insts],
+        "works_count": [a.get("works_count", 0) for a, _ in kept],
+        "cited_by_count": [a.get("cited_by_count", 0) for a, _ in kept],
+        "fields": ["; ".join([c.get("display_name", "") for c in (a.get("x_concepts") or [])]) for a, _ in kept],
+        "field_group": [field_name] * len(kept),
+        "primary_concept_id": [det.get("primary_concept_id") for det in dets],
+        "primary_concept_name": [det.get("primary_concept_name") for det in dets],
+        "primary_concept_score": [det.get("primary_concept_score") for det in dets],
+        "best_in_field_score": [det.get("best_in_field_score") for det in dets],
+        "best_in_field_id": [det.get("best_in_field_id") for det in dets],
+        "best_in_field_name": [det.get("best_in_field_name") for det in dets],
+        "is_primary_in_field": [det.get("is_primary_in_field") for det in dets],
+    }
+
+def fetch_authors_for_field(field):
+    """Loop principal de coleta para o campo informado"""
+    name = field["name"]
+    cursor = load_cursor(field["cursor_path"])
+    if cursor == CURSOR_DONE:
+        print(f"✅ [{name}] Already complete — skipping (delete {field['cursor_path']} to collect again)")
+        return
 
+    field_desc = load_econ_descendants(field["id"], name)   # prefetch
+    scanned = kept_total = 0
     total_candidates = None
-    sleep_s = SLEEP
 
-    print(f"📥 Starting: {ECONOMICS_NAME} (min_score={MIN_ECON_SCORE}, top_k={REQUIRE_ECON_TOP_K}, rel≥{MIN_ECON_RELATIVE}, borderline<{BORDERLINE_SCORE}→share≥{MIN_ECON_SHARE})")
+    print(f"📥 Starting: {name} (min_score={field['min_score']}, top_k={field['top_k']}, rel≥{field['min_relative']}, borderline<{field['borderline_score']}→share≥{field['min_share']})")
     if cursor != "*":
-        print("↩️ Resuming from saved cursor")
+        print(f"↩️ [{name}] Resuming from saved cursor")
 
-    fh, writer = init_csv(OUT_PATH)
+    fh, tmp_path = init_csv(field["out_path"], resume=cursor != "*")
+    # O paginador já pede a próxima página enquanto esta é filtrada e gravada
+    pages = paginate("authors", f"x_concepts.id:{field['id']}", AUTHORS_SELECT,
+                     per_page=PER_PAGE_AUTHORS, cursor=cursor, timeout=AUTHORS_TIMEOUT)
+    completed = False
     try:
-        while True:
-            params = {
-                "filter": f"x_concepts.id:{ECONOMICS_ID}",
-                "per-page": PER_PAGE_AUTHORS,
-                "cursor": cursor,
-                "select": "id,display_name,orcid,last_known_institutions,works_count,cited_by_count,x_concepts"
-            }
-            r = _get(base_url, params=params, timeout=AUTHORS_TIMEOUT)
-            
-            if not r:
-                print("⚠️ Request failed, backing off...")
-                sleep_s = min(MAX_SLEEP, sleep_s * BACKOFF_MULT)
-                time.sleep(sleep_s)
-                continue
-            
-            if r.status_code == 429:
-                retry_after = parse_retry_after(r.headers.get('Retry-After'))
-                print(f"⏳ Rate limited. Sleeping for {retry_after}s")
-                time.sleep(retry_after)
-                sleep_s = min(MAX_SLEEP, sleep_s * BACKOFF_MULT)
-                continue
-            
-            if r.status_code >= 500:
-                print(f"⚠️ Server error {r.status_code}, backing off")
-                sleep_s = min(MAX_SLEEP, sleep_s * BACKOFF_MULT)
-                time.sleep(sleep_s)
-                continue
-            
-            # Sucesso - aplica cooldown
-            sleep_s = max(MIN_SLEEP, sleep_s * COOLDOWN_MULT)
-
-            data = r.json()
+        for data in pages:
             if total_candidates is None:
                 total_candidates = data.get("meta", {}).get("count", 0)
-                print(f"🔢 Total available = {total_candidates}")
+                print(f"🔢 [{name}] Total available = {total_candidates}")
 
             results = data.get("results", [])
-            if not results:
-                break
+            next_cursor = data.get("meta", {}).get("next_cursor")
 
-            kept_this_page = 0
-            for a in results:
-                ok, det = author_passes_field_filter_strict(a, field_desc)
-                if not ok:
-                    continue
-
-                lki = a.get("last_known_institutions") or []
-                inst = lki[0] if (isinstance(lki, list) and lki) else {}
-
-                writer.writerow({
-                    "author_id": a.get("id"),
-                    "name": a.get("display_name"),
-                    "orcid": a.get("orcid"),
-                    "institution_id": inst.get("id", "N/A"),
-                    "affiliation": inst.get("display_name", "N/A"),
-                    "country": inst.get("country_code", "N/A"),
-                    "works_count": a.get("works_count", 0),
-                    "cited_by_count": a.get("cited_by_count", 0),
-                    "fields": "; ".join([c.get("display_name", "") for c in (a.get("x_concepts") or [])]),
-                    "field_group": ECONOMICS_NAME,
-                    "primary_concept_id": det.get("primary_concept_id"),
-                    "primary_concept_name": det.get("primary_concept_name"),
-                    "primary_concept_score": det.get("primary_concept_score"),
-                    "best_in_field_score": det.get("best_in_field_score"),
-                    "best_in_field_id": det.get("best_in_field_id"),
-                    "best_in_field_name": det.get("best_in_field_name"),
-                    "is_primary_in_field": det.get("is_primary_in_field"),
-                })
-                kept_this_page += 1
-                kept_total += 1
+            # Critérios locais primeiro; contagens dos borderline da página saem em paralelo
+            prechecked = [(a, *_field_filter_precheck(a, field_desc, field)) for a in results]
+            borderline = [a.get("id") for a, ok, needs_share, _ in prechecked if ok and needs_share]
+            shares = check_econ_shares(borderline, field["id"], field["min_share"]) if borderline else {}
 
-            scanned += len(results)
-            print(f"📊 Scanned {scanned} | kept {kept_total} (+{kept_this_page}) | sleep {sleep_s:.2f}s")
+            kept = [(a, det) for a, ok, needs_share, det in prechecked
+                    if ok and (not needs_share or shares.get(a.get("id")))]
+            kept_this_page = len(kept)
+            kept_total += kept_this_page
 
-            next_cursor = data.get("meta", {}).get("next_cursor")
-            save_cursor(next_cursor)
-            cursor = next_cursor
-            if not cursor:
-                break
+            # Fim da página: colunas (SoA) → uma única escrita com a página inteira, antes de salvar o cursor
+            if kept:
+                cols = _page_columns(kept, name)
+                fh.write(_csv_bytes(zip(*[cols[k] for k in CSV_FIELDS])))
+            fh.flush()
 
-            if scanned % (PER_PAGE_AUTHORS * 5) == 0:
-                fh.flush()
+            scanned += len(results)
+            print(f"📊 [{name}] Scanned {scanned} | kept {kept_total} (+{kept_this_page})")
 
-            if _SHOULD_STOP:
-                print("🛟 Graceful stop — checkpoint saved.")
-                break
+            save_cursor(field["cursor_path"], next_cursor)
 
-            time.sleep(sleep_s)
+            if _SHOULD_STOP and next_cursor:
+                print(f"🛟 [{name}] Graceful stop — checkpoint saved.")
+                break
+        else:
+            completed = True
     finally:
+        pages.close()
         fh.close()
-        print(f"💾 CSV closed: {OUT_PATH}")
+
+    # Concluído ou parada graciosa: publica o CSV de forma atômica (em erro, o .tmp fica para retomar)
+    os.replace(tmp_path, field["out_path"])
+    print(f"💾 CSV closed: {field['out_path']}")
+
+    # Campo completo: marca o cursor como concluído e gera o Parquet
+    # (numa parada graciosa o CSV ainda vai crescer)
+    if completed:
+        save_cursor(field["cursor_path"], CURSOR_DONE)
+        export_parquet(field["out_path"])
 
 def process_single_field(field_config):
     """Processa um único campo com base na configuração fornecida"""
@@ -431,11 +549,13 @@ def process_single_field(field_config):
     print(f"PROCESSANDO CAMPO: {field_config['nome']}")
     print(f"{'='*60}")
     
-    # Atualiza as configurações com base no campo atual
-    update_config_for_field(field_config)
-    
-    # Executa a coleta para este campo
-    fetch_authors_for_field()
+    # Campos ainda na fila quando o Ctrl+C chega nem começam
+    if _SHOULD_STOP:
+        print(f"🛟 Skipping {field_config['nome']} — stop requested")
+        return
+
+    # Executa a coleta para este campo com as configurações dele
+    fetch_authors_for_field(field_settings(field_config))
 
 def main():
     """Função principal que processa todos os campos definidos na configuração"""
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson (opcional) decodifica as respostas ~3x mais rápido que o json da stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+API_BASE = "https://api.openalex.org"
+
+# Polite pool do OpenAlex: e-mail (e opcionalmente API key) identificam o cliente
+OPENALEX_MAILTO = os.environ.get("OPENALEX_MAILTO", "")
+OPENALEX_API_KEY = os.environ.get("OPENALEX_API_KEY", "")
+
+# Limites globais do processo (todas as threads e todos os scrapers que usam este módulo)
+MAX_IN_FLIGHT = 8                    # requisições simultâneas
+MAX_REQUESTS_PER_SECOND = 9          # abaixo do teto de ~10 req/s do polite pool
+
+# Backoff quando as tentativas do adapter se esgotam (ou a conexão falha)
+MIN_SLEEP, MAX_SLEEP = 0.05, 1.25
+BACKOFF_MULT, COOLDOWN_MULT = 1.5, 0.9
+
+# Sessão HTTP e cabeçalhos (keep-alive compartilhado)
+SESSION = requests.Session()
+SESSION.headers.update({
+    "Accept-Encoding": "gzip",
+    "User-Agent": f"author-scraper/2.0 (mailto:{OPENALEX_MAILTO})" if OPENALEX_MAILTO else "author-scraper/2.0"
+})
+# 429/5xx são repetidos pelo urllib3 com backoff exponencial, respeitando Retry-After
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=8,
+        backoff_factor=0.4,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=["GET"]
+    )
+))
+
+class TokenBucket:
+    """Limitador de taxa global (token bucket) compartilhado por todas as threads"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_RATE_LIMITER = TokenBucket(rate=MAX_REQUESTS_PER_SECOND, capacity=MAX_REQUESTS_PER_SECOND)
+_IN_FLIGHT = threading.Semaphore(MAX_IN_FLIGHT)
+
+# Pool para buscar a próxima página de cada paginação enquanto a atual é processada
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT)
+
+def api_json(response):
+    """Decodifica o corpo JSON da resposta (orjson se disponível)"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def api_get(url, params=None, timeout=30):
+    """SESSION.get com mailto/api_key, limite de taxa global e tentativas no adapter; None em falha"""
+    params = dict(params or {})
+    if OPENALEX_MAILTO:
+        params["mailto"] = OPENALEX_MAILTO
+    if OPENALEX_API_KEY:
+        params["api_key"] = OPENALEX_API_KEY
+
+    _RATE_LIMITER.acquire()
+    try:
+        with _IN_FLIGHT:
+            return SESSION.get(url, params=params, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ Request failed: {e}")
+        return None
+
+def paginate(endpoint, filter_str, select, per_page=200, cursor="*", timeout=30):
+    """Percorre /<endpoint> por cursor, devolvendo o JSON de cada página.
+
+    A próxima página é pedida antes de a atual ser devolvida, então a rede corre em
+    paralelo com o processamento de quem consome. Falhas (tentativas esgotadas) fazem
+    backoff e repetem a mesma página; status não repetível levanta HTTPError.
+    """
+    url = f"{API_BASE}/{endpoint}"
+
+    def fetch(page_cursor):
+        params = {"filter": filter_str, "per-page": per_page, "cursor": page_cursor}
+        if select:
+            params["select"] = select
+        return api_get(url, params=params, timeout=timeout)
+
+    sleep_s = MIN_SLEEP
+    future = _PREFETCH_EXECUTOR.submit(fetch, cursor)
+    try:
+        while True:
+            r = future.result()
+            if r is None:
+                sleep_s = min(MAX_SLEEP, sleep_s * BACKOFF_MULT)
+                print(f"⚠️ Backing off {sleep_s:.2f}s before retrying {endpoint} page")
+                time.sleep(sleep_s)
+                future = _PREFETCH_EXECUTOR.submit(fetch, cursor)
+                continue
+            r.raise_for_status()
+            sleep_s = max(MIN_SLEEP, sleep_s * COOLDOWN_MULT)
+
+            data = api_json(r)
+            next_cursor = data.get("meta", {}).get("next_cursor")
+            if not data.get("results"):
+                return
+
+            # Dispara a próxima página antes de entregar a atual
+            future = _PREFETCH_EXECUTOR.submit(fetch, next_cursor) if next_cursor else None
+            yield data
+
+            if future is None:
+                return
+            cursor = next_cursor
+    finally:
+        if future is not None:
+            future.cancel()